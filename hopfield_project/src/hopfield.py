@@ -9,7 +9,47 @@ A brain-inspired associative memory system where:
 """
 
 import numpy as np
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Union
+
+from .patterns import random_bipolar
+
+
+def pack_bipolar(states: np.ndarray) -> np.ndarray:
+    """
+    Pack bipolar states into uint64 bitsets (one bit per neuron).
+    
+    A firing neuron (+1) becomes a set bit, a silent neuron (-1) a clear
+    bit. Packing runs along the last axis, so a batch of states of shape
+    (n_states, n_neurons) becomes (n_states, ceil(n_neurons / 64)) words.
+    Unused trailing bits are zero in every state, so they never count
+    towards a Hamming distance.
+    
+    Parameters:
+    -----------
+    states : np.ndarray
+        State vector(s) with values in {-1, +1}
+        
+    Returns:
+    --------
+    packed : np.ndarray
+        uint64 words holding the bit representation of each state
+    """
+    bits = np.packbits(np.asarray(states) > 0, axis=-1)
+    pad = -bits.shape[-1] % 8
+    if pad:
+        bits = np.pad(bits, [(0, 0)] * (bits.ndim - 1) + [(0, pad)])
+    return np.ascontiguousarray(bits).view(np.uint64)
+
+
+def _is_bipolar(states: np.ndarray) -> bool:
+    """True if every value is exactly -1 or +1, so packing is lossless."""
+    return bool(np.all(np.abs(states) == 1))
+
+
+def _packed_hamming(states1: np.ndarray, states2: np.ndarray) -> Union[int, np.ndarray]:
+    """Hamming distance of {-1, +1} states as a popcount of their packed XOR."""
+    diff = np.bitwise_xor(pack_bipolar(states1), pack_bipolar(states2))
+    return np.bitwise_count(diff).sum(axis=-1, dtype=np.int64)
 
 
 class HopfieldNetwork:
@@ -40,7 +80,9 @@ class HopfieldNetwork:
             Number of neurons in the network (e.g., 100 for 10x10 images)
         """
         self.n_neurons = n_neurons
-        self.weights = np.zeros((n_neurons, n_neurons))
+        # float32 halves the bytes streamed per product with W; states are
+        # cast to the weight dtype so NumPy never upcasts W to float64
+        self.weights = np.zeros((n_neurons, n_neurons), dtype=np.float32)
         self.patterns = None
         
     def train(self, patterns: np.ndarray):
@@ -67,14 +109,20 @@ class HopfieldNetwork:
             Array of shape (n_patterns, n_neurons) with values in {-1, +1}
         """
         patterns = np.atleast_2d(patterns)
-        self.patterns = patterns
+        # Kept as one contiguous (P, N) block in the weight dtype: float32
+        # holds {-1, +1} exactly, dot products on it cannot overflow as
+        # int8 ones would, and the same array feeds the Hebbian product
+        self.patterns = np.ascontiguousarray(patterns, dtype=self.weights.dtype)
         n_patterns = patterns.shape[0]
         
-        # Hebbian learning: accumulate outer products
-        self.weights = np.zeros((self.n_neurons, self.n_neurons))
-        for pattern in patterns:
-            # Outer product: w_ij += ξ_i * ξ_j
-            self.weights += np.outer(pattern, pattern)
+        # Hebbian learning: the sum of outer products is one GEMM, xi^T xi.
+        # It is written into the existing weight matrix, so retraining the
+        # same network (e.g. across capacity trials) does not reallocate W.
+        shape = (self.n_neurons, self.n_neurons)
+        if self.weights.shape != shape or not self.weights.flags.c_contiguous:
+            self.weights = np.zeros(shape, dtype=np.float32)
+        xi = self.patterns
+        np.dot(xi.T, xi, out=self.weights)
         
         # Normalize by number of neurons
         self.weights /= self.n_neurons
@@ -82,9 +130,9 @@ class HopfieldNetwork:
         # Zero diagonal (no self-connections)
         np.fill_diagonal(self.weights, 0)
         
-    def energy(self, state: np.ndarray) -> float:
+    def energy(self, state: np.ndarray) -> Union[float, np.ndarray]:
         """
-        Compute the energy of a given state.
+        Compute the energy of a given state, or of a batch of states.
         
         Mathematical Form:
         ------------------
@@ -99,16 +147,22 @@ class HopfieldNetwork:
         Parameters:
         -----------
         state : np.ndarray
-            Current state vector of shape (n_neurons,) with values in {-1, +1}
+            Current state vector of shape (n_neurons,) with values in {-1, +1},
+            or a stack of states of shape (n_states, n_neurons)
             
         Returns:
         --------
-        energy : float
-            Energy value (more negative = more stable)
+        energy : float or np.ndarray
+            Energy value (more negative = more stable); one value per row
+            for a batch, from a single GEMM instead of one call per state
         """
-        return -0.5 * np.dot(state, np.dot(self.weights, state))
+        state = np.asarray(state).astype(self.weights.dtype, copy=False)
+        if state.ndim == 1:
+            return -0.5 * np.dot(state, np.dot(self.weights, state))
+        return -0.5 * np.einsum('ij,ij->i', state, state @ self.weights.T)
     
-    def update_async(self, state: np.ndarray, indices: Optional[List[int]] = None) -> np.ndarray:
+    def update_async(self, state: np.ndarray, indices: Optional[List[int]] = None,
+                     out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Perform asynchronous update (one neuron at a time).
         
@@ -129,28 +183,43 @@ class HopfieldNetwork:
             Current state vector
         indices : List[int], optional
             Specific neurons to update. If None, update random neuron.
+        out : np.ndarray, optional
+            Buffer of shape (n_neurons,) and the weight dtype to write the
+            new state into instead of a fresh copy; may be state itself
+            to update in place
             
         Returns:
         --------
         new_state : np.ndarray
-            Updated state vector
+            Updated state vector (out, if given)
         """
-        new_state = state.copy()
+        state = state.astype(self.weights.dtype, copy=False)
+        if out is None:
+            new_state = state.copy()
+        else:
+            new_state = out
+            np.copyto(new_state, state)
         
         if indices is None:
             # Update one random neuron
             indices = [np.random.randint(0, self.n_neurons)]
+        indices = np.asarray(indices, dtype=np.intp)
         
-        for i in indices:
-            # Compute weighted input (like synaptic input to neuron i)
-            h_i = np.dot(self.weights[i], state)
-            
-            # Update neuron based on sign of input
-            new_state[i] = 1 if h_i > 0 else -1 if h_i < 0 else state[i]
+        # Every selected neuron reads the state as it was before this call,
+        # so their inputs are independent: one product with the selected
+        # rows of W replaces a dot product per neuron
+        h = self.weights[indices] @ state
+        
+        # Update neurons based on sign of input, as in update_sync: the
+        # sign is taken in place and the zeros it leaves mark the ties
+        new_h = np.sign(h, out=h)
+        np.copyto(new_h, state[indices], where=new_h == 0)  # Keep state if input is zero
+        new_state[indices] = new_h
         
         return new_state
     
-    def update_sync(self, state: np.ndarray) -> np.ndarray:
+    def update_sync(self, state: np.ndarray,
+                    out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Perform synchronous update (all neurons at once).
         
@@ -161,18 +230,25 @@ class HopfieldNetwork:
         -----------
         state : np.ndarray
             Current state vector
+        out : np.ndarray, optional
+            Buffer of shape (n_neurons,) and the weight dtype to write the
+            new state into, so a loop of updates can reuse two buffers
+            instead of allocating every step; must not be state itself,
+            which is still read for the ties
             
         Returns:
         --------
         new_state : np.ndarray
-            Updated state vector
+            Updated state vector (out, if given)
         """
         # Compute input to all neurons
-        h = np.dot(self.weights, state)
+        state = state.astype(self.weights.dtype, copy=False)
+        h = np.matmul(self.weights, state, out=out)
         
-        # Update all neurons simultaneously
-        new_state = np.sign(h)
-        new_state[h == 0] = state[h == 0]  # Keep state if input is zero
+        # Update all neurons simultaneously, taking the sign in place in h;
+        # sign(0) is 0, so the zeros left behind mark the ties
+        new_state = np.sign(h, out=h)
+        np.copyto(new_state, state, where=new_state == 0)  # Keep state if input is zero
         
         return new_state
     
@@ -180,7 +256,8 @@ class HopfieldNetwork:
                  initial_state: np.ndarray, 
                  max_iter: int = 100,
                  mode: str = 'async',
-                 record_trajectory: bool = False) -> Tuple[np.ndarray, dict]:
+                 record_trajectory: bool = False,
+                 max_history: Optional[int] = None) -> Tuple[np.ndarray, dict]:
         """
         Retrieve a stored pattern from a noisy/partial input.
         
@@ -206,6 +283,10 @@ class HopfieldNetwork:
             'async' for asynchronous (safer), 'sync' for synchronous
         record_trajectory : bool
             If True, record energy and states during retrieval
+        max_history : int, optional
+            With record_trajectory, keep at most this many states in
+            'state_trajectory' (the earliest ones). The energy is still
+            recorded at every step. If None, keep every state.
             
         Returns:
         --------
@@ -216,9 +297,10 @@ class HopfieldNetwork:
             - 'converged': bool
             - 'iterations': int
             - 'energy_trajectory': list (if record_trajectory=True)
-            - 'state_trajectory': list (if record_trajectory=True)
+            - 'state_trajectory': list (if record_trajectory=True,
+              at most max_history entries)
         """
-        state = initial_state.copy()
+        state = np.array(initial_state, dtype=self.weights.dtype)
         info = {
             'converged': False,
             'iterations': 0,
@@ -226,28 +308,67 @@ class HopfieldNetwork:
             'state_trajectory': []
         }
         
+        # When recording, states are never modified in place (each update
+        # builds a new array), so the trajectory can hold references
+        keep_states = max_history if max_history is not None else max_iter + 1
+        
+        # Input to every neuron, h = W s, is carried from one iteration to
+        # the next: it drives the synchronous updates and gives the energy
+        # of the current state as -1/2 * s . h without a second product
+        # with W
+        weights = self.weights
+        h = weights @ state
+        
+        # Without a trajectory, synchronous steps alternate between the
+        # state buffer and this spare one instead of allocating each step
+        spare = None if record_trajectory else np.empty_like(state)
+        
         if record_trajectory:
-            info['energy_trajectory'].append(self.energy(state))
-            info['state_trajectory'].append(state.copy())
+            info['energy_trajectory'].append(-0.5 * np.dot(state, h))
+            if keep_states > 0:
+                info['state_trajectory'].append(state)
         
         for iteration in range(max_iter):
             # Update neurons
             if mode == 'async':
-                # Update all neurons sequentially in random order
-                new_state = state.copy()
+                # Update all neurons sequentially in random order. A sweep
+                # in which no neuron flips is a fixed point, so tracking
+                # flips replaces the comparison with the previous state;
+                # without a trajectory to keep, the sweep runs in place
+                new_state = state.copy() if record_trajectory else state
+                changed = False
+                
+                # Each neuron reads a freshly computed input, W[i] . s, at
+                # its visit: patching h after each flip would accumulate
+                # float32 rounding, so exact-zero inputs would stop being
+                # ties and resolve differently
                 indices = np.random.permutation(self.n_neurons)
                 for i in indices:
-                    h_i = np.dot(self.weights[i], new_state)
-                    new_state[i] = 1 if h_i > 0 else -1 if h_i < 0 else new_state[i]
+                    h_i = np.dot(weights[i], new_state)
+                    s_i = 1 if h_i > 0 else -1 if h_i < 0 else new_state[i]
+                    if s_i != new_state[i]:
+                        new_state[i] = s_i
+                        changed = True
+                stable = not changed
             else:
-                new_state = self.update_sync(state)
+                # As update_sync, from the input already computed
+                new_state = np.sign(h, out=spare)
+                np.copyto(new_state, state, where=new_state == 0)  # Keep state if input is zero
+                stable = np.array_equal(new_state, state)
+                if spare is not None:
+                    spare = state  # Its buffer takes the next update
+            
+            # Fresh input for the new state
+            if not stable:
+                np.matmul(weights, new_state, out=h)
             
             if record_trajectory:
-                info['energy_trajectory'].append(self.energy(new_state))
-                info['state_trajectory'].append(new_state.copy())
+                info['energy_trajectory'].append(-0.5 * np.dot(new_state, h))
+                if len(info['state_trajectory']) < keep_states:
+                    info['state_trajectory'].append(new_state)
             
             # Check convergence
-            if np.array_equal(new_state, state):
+            if stable:
                 info['converged'] = True
                 info['iterations'] = iteration + 1
                 break
@@ -257,7 +378,91 @@ class HopfieldNetwork:
         
         return state, info
     
-    def add_noise(self, pattern: np.ndarray, noise_level: float = 0.2) -> np.ndarray:
+    def retrieve_batch(self,
+                       initial_states: np.ndarray,
+                       max_iter: int = 100,
+                       convergence: str = 'state') -> Tuple[np.ndarray, dict]:
+        """
+        Retrieve stored patterns for a whole batch of inputs at once.
+        
+        Runs synchronous updates on every state together: stacking the
+        states as rows of X turns one matrix-vector product per input into
+        a single matrix-matrix product, sign(X @ W^T), per iteration.
+        Rows that have converged are frozen and left out of later
+        products, and iteration stops as soon as every state has converged.
+        
+        Parameters:
+        -----------
+        initial_states : np.ndarray
+            Starting states of shape (n_states, n_neurons)
+        max_iter : int
+            Maximum number of synchronous update iterations
+        convergence : str
+            'state' stops once every state is a fixed point (exact).
+            'energy' stops once every state's energy is unchanged between
+            iterations. The energy E = -1/2 * x . (W x) reuses the W x
+            product already computed for the update, so no extra matrix
+            sweep is needed and the energy trajectory is returned for free.
+            Note that a synchronous 2-cycle between states of equal energy
+            also counts as converged in this mode.
+        
+        Returns:
+        --------
+        final_states : np.ndarray
+            Retrieved patterns, one row per input
+        info : dict
+            Dictionary with convergence information:
+            - 'converged': np.ndarray of bool, one entry per input
+            - 'iterations': int (iterations run for the whole batch)
+            - 'energy_trajectory': list of per-state energy arrays
+              (if convergence='energy')
+        """
+        states = np.array(initial_states, dtype=self.weights.dtype, ndmin=2)
+        info = {
+            'converged': np.zeros(states.shape[0], dtype=bool),
+            'iterations': 0
+        }
+        if convergence == 'energy':
+            energies = np.full(states.shape[0], np.nan)
+            info['energy_trajectory'] = []
+        
+        # Rows still being updated; converged rows are frozen and dropped
+        # from later GEMMs, since a fixed point never changes again
+        active = np.arange(states.shape[0])
+        
+        for iteration in range(max_iter):
+            current = states[active]
+            
+            # One GEMM computes the input to every neuron of every state
+            h = current @ self.weights.T
+            
+            if convergence == 'energy':
+                current_energies = -0.5 * np.einsum('ij,ij->i', current, h)
+                stable = current_energies == energies[active]
+                energies[active] = current_energies
+                info['energy_trajectory'].append(energies.copy())
+                info['converged'][active[stable]] = True
+                active, current, h = active[~stable], current[~stable], h[~stable]
+                if active.size == 0:
+                    break
+            
+            new_states = np.sign(h, out=h)
+            np.copyto(new_states, current, where=new_states == 0)  # Keep state if input is zero
+            states[active] = new_states
+            info['iterations'] = iteration + 1
+            
+            if convergence != 'energy':
+                fixed = np.all(new_states == current, axis=1)
+                info['converged'][active[fixed]] = True
+                active = active[~fixed]
+                if active.size == 0:
+                    break
+        
+        return states, info
+    
+    def add_noise(self, pattern: np.ndarray, noise_level: float = 0.2,
+                  exact: bool = True,
+                  rng: Optional[np.random.Generator] = None) -> np.ndarray:
         """
         Add random noise to a pattern by flipping bits.
         
@@ -267,19 +472,88 @@ class HopfieldNetwork:
             Original pattern
         noise_level : float
             Fraction of bits to flip (0.0 to 1.0)
+        exact : bool
+            If True, flip exactly int(N * noise_level) distinct bits.
+            If False, flip each bit independently with probability
+            noise_level: a single branchless mask pass with no distinct-index
+            sampling, flipping noise_level * N bits on average.
+        rng : np.random.Generator, optional
+            Generator to draw from. If None, uses the global NumPy RNG;
+            passing one shared np.random.default_rng(seed) through an
+            experiment keeps it reproducible without global reseeding.
             
         Returns:
         --------
         noisy_pattern : np.ndarray
             Pattern with noise added
         """
+        rng = np.random if rng is None else rng
+        if not exact:
+            flips = rng.random(pattern.shape) < noise_level
+            noisy = pattern.copy()
+            np.negative(noisy, out=noisy, where=flips)
+            return noisy
+        
         noisy = pattern.copy()
         n_flips = int(self.n_neurons * noise_level)
-        flip_indices = np.random.choice(self.n_neurons, n_flips, replace=False)
+        flip_indices = rng.choice(self.n_neurons, n_flips, replace=False)
         noisy[flip_indices] *= -1
         return noisy
     
-    def compute_overlap(self, state1: np.ndarray, state2: np.ndarray) -> float:
+    def add_noise_batch(self, patterns: np.ndarray, noise_level: float = 0.2,
+                        n_copies: int = 1, exact: bool = True,
+                        rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Make noisy copies of many patterns at once.
+        
+        Equivalent to calling add_noise on every row of the tiled batch,
+        but the random numbers for all copies are drawn into one buffer and
+        the flips are applied with a single mask, so an experiment with
+        many trials costs a handful of array operations instead of one
+        call per trial.
+        
+        Parameters:
+        -----------
+        patterns : np.ndarray
+            Patterns of shape (n_patterns, n_neurons), or a single pattern
+        noise_level : float
+            Fraction of bits to flip (0.0 to 1.0)
+        n_copies : int
+            Number of noisy copies of each pattern
+        exact : bool
+            If True, flip exactly int(N * noise_level) distinct bits per row;
+            if False, flip each bit independently with probability noise_level
+        rng : np.random.Generator, optional
+            Generator to draw from; defaults to the global NumPy RNG
+            
+        Returns:
+        --------
+        noisy_patterns : np.ndarray
+            Array of shape (n_copies * n_patterns, n_neurons); row
+            k * n_patterns + j is a noisy copy of pattern j
+        """
+        tiled = np.tile(np.atleast_2d(patterns), (n_copies, 1))
+        rng = np.random if rng is None else rng
+        noise = rng.random(tiled.shape)
+        
+        if not exact:
+            flips = noise < noise_level
+        else:
+            # The n_flips smallest random keys of each row are a uniform
+            # sample of distinct positions, found in O(N) by argpartition
+            n_flips = int(self.n_neurons * noise_level)
+            flips = np.zeros(tiled.shape, dtype=bool)
+            if n_flips > 0:
+                idx = np.argpartition(noise, n_flips - 1, axis=1)[:, :n_flips]
+                np.put_along_axis(flips, idx, True, axis=1)
+        
+        # tiled is already a fresh copy, so the flips are applied in place
+        # instead of building a negated copy to select from
+        np.negative(tiled, out=tiled, where=flips)
+        return tiled
+    
+    def compute_overlap(self, state1: np.ndarray,
+                        state2: np.ndarray) -> Union[float, np.ndarray]:
         """
         Compute normalized overlap between two states.
         
@@ -288,32 +562,88 @@ class HopfieldNetwork:
         Parameters:
         -----------
         state1, state2 : np.ndarray
-            State vectors to compare
+            State vectors to compare; either may be a stack of states of
+            shape (n_states, n_neurons), e.g. all stored patterns at once
             
         Returns:
         --------
-        overlap : float
-            Normalized dot product in range [-1, 1]
+        overlap : float or np.ndarray
+            Normalized dot product in range [-1, 1], one per row for stacks
         """
-        return np.dot(state1, state2) / self.n_neurons
+        # Cast to the weight dtype as in energy(), so int8 patterns cannot
+        # overflow; one einsum is the dot product for single and stacked states
+        state1 = np.asarray(state1).astype(self.weights.dtype, copy=False)
+        state2 = np.asarray(state2).astype(self.weights.dtype, copy=False)
+        return np.einsum('...i,...i', state1, state2) / self.n_neurons
     
-    def hamming_distance(self, state1: np.ndarray, state2: np.ndarray) -> int:
+    def hamming_distance(self, state1: np.ndarray,
+                         state2: np.ndarray) -> Union[int, np.ndarray]:
         """
         Compute Hamming distance (number of differing bits).
         
+        For {-1, +1} states both are packed into uint64 bitsets, so the
+        distance is a popcount of their XOR: two words per 100-neuron state
+        instead of a full element-wise comparison. Any other values (e.g.
+        0 for an unknown neuron) are compared element-wise.
+        
         Parameters:
         -----------
         state1, state2 : np.ndarray
-            State vectors to compare
+            State vectors to compare; either may be a stack of states of
+            shape (n_states, n_neurons)
             
         Returns:
         --------
-        distance : int
-            Number of positions where states differ
+        distance : int or np.ndarray
+            Number of positions where states differ, one per row for stacks
+        """
+        state1, state2 = np.asarray(state1), np.asarray(state2)
+        if not (_is_bipolar(state1) and _is_bipolar(state2)):
+            return np.sum(state1 != state2, axis=-1)
+        return _packed_hamming(state1, state2)
+    
+    def state_statistics(self, state: np.ndarray,
+                         target: np.ndarray) -> Tuple[Union[float, np.ndarray],
+                                                      Union[float, np.ndarray],
+                                                      Union[int, np.ndarray]]:
+        """
+        Compute energy, overlap and Hamming distance of a state in one pass.
+        
+        Equivalent to calling energy(state), compute_overlap(state, target)
+        and hamming_distance(state, target) back to back, but the weight
+        matrix is swept only once and, for {-1, +1} states, both arrays are
+        checked and packed once and the overlap is derived from the Hamming
+        distance (m = 1 - 2 * d / N).
+        
+        Parameters:
+        -----------
+        state : np.ndarray
+            State vector to evaluate (e.g., a retrieved pattern), or a
+            stack of states of shape (n_states, n_neurons)
+        target : np.ndarray
+            Reference pattern (e.g., the stored original)
+        
+        Returns:
+        --------
+        energy : float or np.ndarray
+            Energy of the state
+        overlap : float or np.ndarray
+            Normalized overlap with the target in range [-1, 1]
+        distance : int or np.ndarray
+            Number of positions where state and target differ
         """
-        return np.sum(state1 != state2)
+        state, target = np.asarray(state), np.asarray(target)
+        energy = self.energy(state)  # Cast to the weight dtype, no upcast of W
+        if _is_bipolar(state) and _is_bipolar(target):
+            distance = _packed_hamming(state, target)
+            overlap = (self.n_neurons - 2 * distance) / self.n_neurons
+        else:
+            distance = np.sum(state != target, axis=-1)
+            overlap = self.compute_overlap(state, target)
+        return energy, overlap, distance
     
-    def check_spurious_attractors(self, n_tests: int = 100) -> List[np.ndarray]:
+    def check_spurious_attractors(self, n_tests: int = 100,
+                                  mode: str = 'async') -> List[np.ndarray]:
         """
         Search for spurious attractors (stable states that aren't stored patterns).
         
@@ -329,6 +659,13 @@ class HopfieldNetwork:
         -----------
         n_tests : int
             Number of random initializations to test
+        mode : str
+            'async' runs one asynchronous retrieval per initialization.
+            'sync' converges all of them together with retrieve_batch (one
+            GEMM per step); a synchronous fixed point is stable under
+            asynchronous updates too, and rows caught in a 2-cycle finish
+            with an asynchronous retrieval. The basins differ between the
+            two dynamics, so the attractors found can differ too.
             
         Returns:
         --------
@@ -337,28 +674,28 @@ class HopfieldNetwork:
         """
         spurious = []
         
-        for _ in range(n_tests):
-            # Random initialization
-            random_state = np.random.choice([-1, 1], size=self.n_neurons)
-            
-            # Let network converge
-            final_state, _ = self.retrieve(random_state, max_iter=50)
-            
-            # Check if this matches any stored pattern
-            is_stored = False
-            for pattern in self.patterns:
-                if np.array_equal(final_state, pattern):
-                    is_stored = True
-                    break
-            
+        # Compare states by their packed bits: membership in a set of
+        # packed rows replaces an O(N) array_equal against every stored
+        # pattern and every spurious state found so far
+        stored = {row.tobytes() for row in pack_bipolar(self.patterns)}
+        seen = set()
+        
+        if mode == 'sync':
+            # Random initializations, converged as one batch
+            random_states = random_bipolar((n_tests, self.n_neurons))
+            final_states, info = self.retrieve_batch(random_states, max_iter=50)
+            for k in np.flatnonzero(~info['converged']):
+                final_states[k], _ = self.retrieve(final_states[k], max_iter=50)
+        else:
+            # Random initialization, then let network converge
+            final_states = (self.retrieve(random_bipolar(self.n_neurons), max_iter=50)[0]
+                            for _ in range(n_tests))
+        
+        for final_state in final_states:
             # If not a stored pattern and not already found, it's spurious
-            if not is_stored:
-                is_new = True
-                for sp in spurious:
-                    if np.array_equal(final_state, sp):
-                        is_new = False
-                        break
-                if is_new:
-                    spurious.append(final_state)
+            key = pack_bipolar(final_state).tobytes()
+            if key not in stored and key not in seen:
+                seen.add(key)
+                spurious.append(final_state)
         
         return spurious
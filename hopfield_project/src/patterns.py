@@ -5,7 +5,107 @@ Tools for creating and manipulating binary patterns for Hopfield networks.
 """
 
 import numpy as np
-from typing import List, Tuple
+from typing import List, Optional, Tuple, Union
+
+
+def random_bipolar(size: Union[int, Tuple[int, ...]],
+                   rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Draw uniformly random {-1, +1} values.
+    
+    Draws integer bits and maps them to {-1, +1} instead of going through
+    np.random.choice, whose generic sampler is much slower for a plain
+    two-value draw.
+    
+    Parameters:
+    -----------
+    size : int or Tuple[int, ...]
+        Output shape
+    rng : np.random.Generator, optional
+        Generator to draw from. If None, uses the global NumPy RNG, so
+        np.random.seed keeps results reproducible.
+        
+    Returns:
+    --------
+    values : np.ndarray
+        int8 array with values in {-1, +1}
+    """
+    if rng is None:
+        bits = np.random.randint(0, 2, size=size, dtype=np.int8)
+    else:
+        bits = rng.integers(0, 2, size=size, dtype=np.int8)
+    return bits * 2 - 1
+
+
+# Simple 10x10 patterns for common letters
+_LETTER_TEMPLATES = {
+    'A': [
+        [0,0,0,1,1,1,1,0,0,0],
+        [0,0,1,1,0,0,1,1,0,0],
+        [0,1,1,0,0,0,0,1,1,0],
+        [0,1,1,0,0,0,0,1,1,0],
+        [1,1,1,1,1,1,1,1,1,1],
+        [1,1,0,0,0,0,0,0,1,1],
+        [1,1,0,0,0,0,0,0,1,1],
+        [1,1,0,0,0,0,0,0,1,1],
+        [1,1,0,0,0,0,0,0,1,1],
+        [1,1,0,0,0,0,0,0,1,1],
+    ],
+    'B': [
+        [1,1,1,1,1,1,1,1,0,0],
+        [1,1,0,0,0,0,0,1,1,0],
+        [1,1,0,0,0,0,0,1,1,0],
+        [1,1,0,0,0,0,0,1,1,0],
+        [1,1,1,1,1,1,1,1,0,0],
+        [1,1,0,0,0,0,0,1,1,0],
+        [1,1,0,0,0,0,0,1,1,0],
+        [1,1,0,0,0,0,0,1,1,0],
+        [1,1,0,0,0,0,0,1,1,0],
+        [1,1,1,1,1,1,1,1,0,0],
+    ],
+    'C': [
+        [0,0,1,1,1,1,1,1,0,0],
+        [0,1,1,0,0,0,0,1,1,0],
+        [1,1,0,0,0,0,0,0,1,1],
+        [1,1,0,0,0,0,0,0,0,0],
+        [1,1,0,0,0,0,0,0,0,0],
+        [1,1,0,0,0,0,0,0,0,0],
+        [1,1,0,0,0,0,0,0,0,0],
+        [1,1,0,0,0,0,0,0,1,1],
+        [0,1,1,0,0,0,0,1,1,0],
+        [0,0,1,1,1,1,1,1,0,0],
+    ],
+    'D': [
+        [1,1,1,1,1,1,1,0,0,0],
+        [1,1,0,0,0,0,1,1,0,0],
+        [1,1,0,0,0,0,0,1,1,0],
+        [1,1,0,0,0,0,0,0,1,1],
+        [1,1,0,0,0,0,0,0,1,1],
+        [1,1,0,0,0,0,0,0,1,1],
+        [1,1,0,0,0,0,0,0,1,1],
+        [1,1,0,0,0,0,0,1,1,0],
+        [1,1,0,0,0,0,1,1,0,0],
+        [1,1,1,1,1,1,1,0,0,0],
+    ],
+    'E': [
+        [1,1,1,1,1,1,1,1,1,1],
+        [1,1,0,0,0,0,0,0,0,0],
+        [1,1,0,0,0,0,0,0,0,0],
+        [1,1,0,0,0,0,0,0,0,0],
+        [1,1,1,1,1,1,1,1,0,0],
+        [1,1,0,0,0,0,0,0,0,0],
+        [1,1,0,0,0,0,0,0,0,0],
+        [1,1,0,0,0,0,0,0,0,0],
+        [1,1,0,0,0,0,0,0,0,0],
+        [1,1,1,1,1,1,1,1,1,1],
+    ],
+}
+
+# {-1, +1} encoded, flattened templates, built once at import
+_LETTER_PATTERNS = {
+    letter: (2 * np.array(template, dtype=np.int8) - 1).ravel()
+    for letter, template in _LETTER_TEMPLATES.items()
+}
 
 
 def generate_letters(letters: List[str], size: int = 10) -> np.ndarray:
@@ -26,85 +126,21 @@ def generate_letters(letters: List[str], size: int = 10) -> np.ndarray:
     """
     patterns = []
     
-    # Simple 10x10 patterns for common letters
-    letter_templates = {
-        'A': [
-            [0,0,0,1,1,1,1,0,0,0],
-            [0,0,1,1,0,0,1,1,0,0],
-            [0,1,1,0,0,0,0,1,1,0],
-            [0,1,1,0,0,0,0,1,1,0],
-            [1,1,1,1,1,1,1,1,1,1],
-            [1,1,0,0,0,0,0,0,1,1],
-            [1,1,0,0,0,0,0,0,1,1],
-            [1,1,0,0,0,0,0,0,1,1],
-            [1,1,0,0,0,0,0,0,1,1],
-            [1,1,0,0,0,0,0,0,1,1],
-        ],
-        'B': [
-            [1,1,1,1,1,1,1,1,0,0],
-            [1,1,0,0,0,0,0,1,1,0],
-            [1,1,0,0,0,0,0,1,1,0],
-            [1,1,0,0,0,0,0,1,1,0],
-            [1,1,1,1,1,1,1,1,0,0],
-            [1,1,0,0,0,0,0,1,1,0],
-            [1,1,0,0,0,0,0,1,1,0],
-            [1,1,0,0,0,0,0,1,1,0],
-            [1,1,0,0,0,0,0,1,1,0],
-            [1,1,1,1,1,1,1,1,0,0],
-        ],
-        'C': [
-            [0,0,1,1,1,1,1,1,0,0],
-            [0,1,1,0,0,0,0,1,1,0],
-            [1,1,0,0,0,0,0,0,1,1],
-            [1,1,0,0,0,0,0,0,0,0],
-            [1,1,0,0,0,0,0,0,0,0],
-            [1,1,0,0,0,0,0,0,0,0],
-            [1,1,0,0,0,0,0,0,0,0],
-            [1,1,0,0,0,0,0,0,1,1],
-            [0,1,1,0,0,0,0,1,1,0],
-            [0,0,1,1,1,1,1,1,0,0],
-        ],
-        'D': [
-            [1,1,1,1,1,1,1,0,0,0],
-            [1,1,0,0,0,0,1,1,0,0],
-            [1,1,0,0,0,0,0,1,1,0],
-            [1,1,0,0,0,0,0,0,1,1],
-            [1,1,0,0,0,0,0,0,1,1],
-            [1,1,0,0,0,0,0,0,1,1],
-            [1,1,0,0,0,0,0,0,1,1],
-            [1,1,0,0,0,0,0,1,1,0],
-            [1,1,0,0,0,0,1,1,0,0],
-            [1,1,1,1,1,1,1,0,0,0],
-        ],
-        'E': [
-            [1,1,1,1,1,1,1,1,1,1],
-            [1,1,0,0,0,0,0,0,0,0],
-            [1,1,0,0,0,0,0,0,0,0],
-            [1,1,0,0,0,0,0,0,0,0],
-            [1,1,1,1,1,1,1,1,0,0],
-            [1,1,0,0,0,0,0,0,0,0],
-            [1,1,0,0,0,0,0,0,0,0],
-            [1,1,0,0,0,0,0,0,0,0],
-            [1,1,0,0,0,0,0,0,0,0],
-            [1,1,1,1,1,1,1,1,1,1],
-        ],
-    }
-    
     for letter in letters:
-        if letter.upper() in letter_templates:
-            pattern = np.array(letter_templates[letter.upper()]).flatten()
-            # Convert to {-1, +1}
-            pattern = 2 * pattern - 1
-            patterns.append(pattern)
+        if letter.upper() in _LETTER_PATTERNS:
+            patterns.append(_LETTER_PATTERNS[letter.upper()])
         else:
             # Generate random pattern for unknown letters
-            pattern = np.random.choice([-1, 1], size=size*size)
+            pattern = random_bipolar(size*size)
             patterns.append(pattern)
     
-    return np.array(patterns)
+    # The int8 templates and draws are widened to the default integer
+    # dtype on return, so integer products of patterns cannot overflow
+    return np.array(patterns, dtype=int)
 
 
-def generate_random_patterns(n_patterns: int, n_neurons: int, density: float = 0.5) -> np.ndarray:
+def generate_random_patterns(n_patterns: int, n_neurons: int, density: float = 0.5,
+                             rng: Optional[np.random.Generator] = None) -> np.ndarray:
     """
     Generate random binary patterns.
     
@@ -116,18 +152,21 @@ def generate_random_patterns(n_patterns: int, n_neurons: int, density: float = 0
         Number of neurons (pattern length)
     density : float
         Fraction of +1 bits (default 0.5 for balanced patterns)
+    rng : np.random.Generator, optional
+        Generator to draw from; defaults to the global NumPy RNG
         
     Returns:
     --------
     patterns : np.ndarray
         Array of shape (n_patterns, n_neurons) with values in {-1, +1}
     """
-    patterns = np.random.choice([-1, 1], size=(n_patterns, n_neurons), 
-                                p=[1-density, density])
+    rng = np.random if rng is None else rng
+    patterns = np.where(rng.random((n_patterns, n_neurons)) < density, 1, -1)
     return patterns
 
 
-def generate_correlated_patterns(n_patterns: int, n_neurons: int, correlation: float = 0.3) -> np.ndarray:
+def generate_correlated_patterns(n_patterns: int, n_neurons: int, correlation: float = 0.3,
+                                 rng: Optional[np.random.Generator] = None) -> np.ndarray:
     """
     Generate patterns with controlled correlation.
     
@@ -141,25 +180,34 @@ def generate_correlated_patterns(n_patterns: int, n_neurons: int, correlation: f
         Pattern length
     correlation : float
         Correlation level (0 = independent, 1 = identical)
+    rng : np.random.Generator, optional
+        Generator to draw from; defaults to the global NumPy RNG
         
     Returns:
     --------
     patterns : np.ndarray
         Correlated patterns
     """
-    # Start with base pattern
-    base = np.random.choice([-1, 1], size=n_neurons)
-    patterns = [base]
+    # Start with base pattern, widened from int8 to the default integer
+    # dtype before tiling so integer products of the patterns cannot
+    # overflow
+    base = random_bipolar(n_neurons, rng).astype(int)
+    patterns = np.tile(base, (n_patterns, 1))
     
-    for _ in range(n_patterns - 1):
-        # Create new pattern correlated with base
-        pattern = base.copy()
-        n_flips = int(n_neurons * (1 - correlation))
-        flip_indices = np.random.choice(n_neurons, n_flips, replace=False)
-        pattern[flip_indices] *= -1
-        patterns.append(pattern)
+    # Every other pattern is the base with exactly n_flips distinct bits
+    # flipped. The n_flips smallest random keys of each row are a uniform
+    # sample of distinct positions, so all rows are drawn at once instead
+    # of one choice(replace=False) call per pattern
+    n_flips = int(n_neurons * (1 - correlation))
+    if n_patterns > 1 and n_flips > 0:
+        sampler = np.random if rng is None else rng
+        keys = sampler.random((n_patterns - 1, n_neurons))
+        flip_indices = np.argpartition(keys, n_flips - 1, axis=1)[:, :n_flips]
+        flips = np.zeros(keys.shape, dtype=bool)
+        np.put_along_axis(flips, flip_indices, True, axis=1)
+        np.negative(patterns[1:], out=patterns[1:], where=flips)
     
-    return np.array(patterns)
+    return patterns
 
 
 def binarize_image(image: np.ndarray, threshold: float = 0.5) -> np.ndarray:
@@ -218,18 +266,15 @@ def compute_pattern_similarity_matrix(patterns: np.ndarray) -> np.ndarray:
     similarity : np.ndarray
         Matrix of normalized overlaps (range [-1, 1])
     """
-    n_patterns = patterns.shape[0]
-    n_neurons = patterns.shape[1]
-    similarity = np.zeros((n_patterns, n_patterns))
-    
-    for i in range(n_patterns):
-        for j in range(n_patterns):
-            similarity[i, j] = np.dot(patterns[i], patterns[j]) / n_neurons
-    
-    return similarity
+    # All pairwise dot products are one GEMM, P P^T. Cast first: int8
+    # patterns (e.g. straight from random_bipolar) would overflow an int8
+    # product.
+    patterns = np.asarray(patterns, dtype=float)
+    return (patterns @ patterns.T) / patterns.shape[1]
 
 
-def add_partial_occlusion(pattern: np.ndarray, occlusion_fraction: float = 0.3) -> np.ndarray:
+def add_partial_occlusion(pattern: np.ndarray, occlusion_fraction: float = 0.3,
+                          rng: Optional[np.random.Generator] = None) -> np.ndarray:
     """
     Simulate partial occlusion by setting some neurons to unknown state.
     
@@ -242,6 +287,8 @@ def add_partial_occlusion(pattern: np.ndarray, occlusion_fraction: float = 0.3)
         Original pattern
     occlusion_fraction : float
         Fraction of pattern to occlude
+    rng : np.random.Generator, optional
+        Generator to draw from; defaults to the global NumPy RNG
         
     Returns:
     --------
@@ -250,9 +297,10 @@ def add_partial_occlusion(pattern: np.ndarray, occlusion_fraction: float = 0.3)
     """
     occluded = pattern.copy()
     n_occluded = int(len(pattern) * occlusion_fraction)
-    occluded_indices = np.random.choice(len(pattern), n_occluded, replace=False)
+    sampler = np.random if rng is None else rng
+    occluded_indices = sampler.choice(len(pattern), n_occluded, replace=False)
     
     # Randomly initialize occluded parts
-    occluded[occluded_indices] = np.random.choice([-1, 1], size=n_occluded)
+    occluded[occluded_indices] = random_bipolar(n_occluded, rng)
     
     return occluded
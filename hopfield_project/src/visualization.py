@@ -4,11 +4,30 @@ Visualization Tools
 Functions for plotting patterns, energy landscapes, and network dynamics.
 """
 
+import os
+
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
+from matplotlib.animation import FFMpegWriter, FuncAnimation, PillowWriter
+from matplotlib.cm import ScalarMappable
+from matplotlib.colors import Normalize
 from typing import List, Tuple, Optional
-import seaborn as sns
+
+from .patterns import random_bipolar
+
+# RGB colours of silent (-1) and firing (+1) neurons, as the gray colormap
+# with vmin=-1, vmax=1 draws them
+_BINARY_LUT = np.array([[0, 0, 0], [255, 255, 255]], dtype=np.uint8)
+
+# Animation writer for each file extension animate_retrieval can save:
+# Pillow encodes the multi-frame image formats itself, ffmpeg encodes the
+# video containers from raw frames streamed over a pipe
+_ANIMATION_WRITERS = {
+    '.gif': PillowWriter, '.png': PillowWriter, '.apng': PillowWriter,
+    '.webp': PillowWriter,
+    '.mp4': FFMpegWriter, '.m4v': FFMpegWriter, '.mov': FFMpegWriter,
+    '.mkv': FFMpegWriter, '.avi': FFMpegWriter, '.webm': FFMpegWriter,
+}
 
 
 def plot_pattern(pattern: np.ndarray, shape: Tuple[int, int], title: str = "", ax=None):
@@ -27,10 +46,15 @@ def plot_pattern(pattern: np.ndarray, shape: Tuple[int, int], title: str = "", a
         Axis to plot on
     """
     if ax is None:
-        fig, ax = plt.subplots(figsize=(4, 4))
+        fig, ax = plt.subplots(figsize=(4, 4), layout='constrained')
     
     image = pattern.reshape(shape)
-    ax.imshow(image, cmap='gray', vmin=-1, vmax=1, interpolation='nearest')
+    if np.all(np.abs(image) == 1):
+        # Pure {-1, +1} pattern: index the two colours directly instead of
+        # running the image through normalisation and the colormap
+        ax.imshow(_BINARY_LUT[(image > 0).view(np.uint8)], interpolation='nearest')
+    else:
+        ax.imshow(image, cmap='gray', vmin=-1, vmax=1, interpolation='nearest')
     ax.set_title(title)
     ax.axis('off')
 
@@ -62,7 +86,7 @@ def plot_retrieval_sequence(original: np.ndarray,
     hamming_retrieved : int, optional
         Hamming distance between retrieved and original
     """
-    fig, axes = plt.subplots(1, 3, figsize=(12, 4))
+    fig, axes = plt.subplots(1, 3, figsize=(12, 4), layout='constrained')
     
     plot_pattern(original, shape, "Original Pattern", ax=axes[0])
     
@@ -76,7 +100,6 @@ def plot_retrieval_sequence(original: np.ndarray,
         title_retrieved += f"\n({hamming_retrieved} bits different)"
     plot_pattern(retrieved, shape, title_retrieved, ax=axes[2])
     
-    plt.tight_layout()
     return fig
 
 
@@ -97,7 +120,7 @@ def plot_energy_trajectory(energy_history: List[float],
     title : str
         Plot title
     """
-    fig, ax = plt.subplots(figsize=(8, 4))
+    fig, ax = plt.subplots(figsize=(8, 4), layout='constrained')
     
     ax.plot(energy_history, 'o-', linewidth=2, markersize=6)
     ax.set_xlabel('Iteration', fontsize=12)
@@ -105,17 +128,15 @@ def plot_energy_trajectory(energy_history: List[float],
     ax.set_title(title, fontsize=14)
     ax.grid(True, alpha=0.3)
     
-    # Annotate initial and final energy
-    ax.annotate(f'Initial: {energy_history[0]:.1f}', 
-                xy=(0, energy_history[0]), 
-                xytext=(10, 10), textcoords='offset points',
-                bbox=dict(boxstyle='round', fc='yellow', alpha=0.5))
-    ax.annotate(f'Final: {energy_history[-1]:.1f}', 
-                xy=(len(energy_history)-1, energy_history[-1]), 
-                xytext=(10, -20), textcoords='offset points',
-                bbox=dict(boxstyle='round', fc='lightgreen', alpha=0.5))
-    
-    plt.tight_layout()
+    # Annotate initial and final energy, stacked in the upper right corner
+    # (placed in axes coordinates), where the descending curve is lowest
+    ax.text(0.98, 0.95, f'Initial: {energy_history[0]:.1f}', 
+            transform=ax.transAxes, ha='right', va='top',
+            bbox=dict(boxstyle='round', fc='yellow', alpha=0.5))
+    ax.text(0.98, 0.82, f'Final: {energy_history[-1]:.1f}', 
+            transform=ax.transAxes, ha='right', va='top',
+            bbox=dict(boxstyle='round', fc='lightgreen', alpha=0.5))
+    
     return fig
 
 
@@ -131,19 +152,37 @@ def plot_weight_matrix(weights: np.ndarray, title: str = "Synaptic Weights"):
     Parameters:
     -----------
     weights : np.ndarray
-        Weight matrix (n_neurons, n_neurons)
+        Weight matrix (n_neurons, n_neurons); above 2048 neurons it is
+        drawn as means over blocks of neurons
     title : str
         Plot title
     """
-    fig, ax = plt.subplots(figsize=(8, 8))
-    
-    im = ax.imshow(weights, cmap='RdBu_r', aspect='auto')
+    fig, ax = plt.subplots(figsize=(8, 8), layout='constrained')
+    
+    # Beyond 2048 neurons the matrix has far more cells than the figure has
+    # pixels, so average it over k x k blocks before handing it to imshow.
+    # When k does not divide N the last row and column of blocks are
+    # narrower and are averaged over the neurons they actually hold, so
+    # every neuron is shown; the extent keeps the axes in neuron indices
+    # and the limits clip that last, narrower block to its true width
+    n = weights.shape[0]
+    k = max(1, n // 2048)
+    m = -(-n // k)
+    if k > 1:
+        starts = np.arange(0, n, k)
+        sizes = np.diff(np.append(starts, n))
+        sums = np.add.reduceat(np.add.reduceat(weights, starts, axis=0), starts, axis=1)
+        weights = sums / np.outer(sizes, sizes)
+    extent = (-0.5, m * k - 0.5, m * k - 0.5, -0.5)
+    
+    im = ax.imshow(weights, cmap='RdBu_r', aspect='auto', extent=extent)
+    ax.set_xlim(-0.5, n - 0.5)
+    ax.set_ylim(n - 0.5, -0.5)
     ax.set_title(title, fontsize=14)
     ax.set_xlabel('Neuron j', fontsize=12)
     ax.set_ylabel('Neuron i', fontsize=12)
     
     plt.colorbar(im, ax=ax, label='Weight w_ij')
-    plt.tight_layout()
     return fig
 
 
@@ -164,20 +203,34 @@ def plot_pattern_similarity_matrix(similarity: np.ndarray,
     pattern_names : List[str], optional
         Names for patterns (e.g., ['A', 'B', 'C'])
     """
-    fig, ax = plt.subplots(figsize=(8, 6))
-    
-    sns.heatmap(similarity, annot=True, fmt='.2f', cmap='coolwarm', 
-                center=0, vmin=-1, vmax=1, square=True, ax=ax,
-                xticklabels=pattern_names, yticklabels=pattern_names)
+    fig, ax = plt.subplots(figsize=(8, 6), layout='constrained')
+    
+    # Plain imshow heatmap (square cells, centred at 0 by the symmetric
+    # limits) instead of seaborn's, which lays out far more per cell
+    im = ax.imshow(similarity, cmap='coolwarm', vmin=-1, vmax=1)
+    n = similarity.shape[0]
+    ax.set_xticks(range(n), pattern_names if pattern_names is not None else range(n))
+    ax.set_yticks(range(n), pattern_names if pattern_names is not None else range(n))
+    ax.spines[:].set_visible(False)
+    fig.colorbar(im, ax=ax)
+    
+    # Annotate each cell, in a colour that stays readable on its fill;
+    # beyond 20 x 20 the labels would not fit in the cells anyway
+    if n <= 20:
+        rgb = im.cmap(im.norm(similarity))[..., :3]
+        dark = rgb @ [0.2126, 0.7152, 0.0722] < 0.5
+        for (i, j), value in np.ndenumerate(similarity):
+            ax.text(j, i, f'{value:.2f}', ha='center', va='center',
+                    color='white' if dark[i, j] else 'black')
     
     ax.set_title('Pattern Similarity Matrix\n(Normalized Overlap)', fontsize=14)
-    plt.tight_layout()
     return fig
 
 
 def plot_capacity_experiment(n_patterns_list: List[int], 
                             accuracy_list: List[float],
-                            theoretical_capacity: Optional[float] = None):
+                            theoretical_capacity: Optional[float] = None,
+                            ax=None):
     """
     Plot retrieval accuracy vs number of stored patterns.
     
@@ -192,8 +245,15 @@ def plot_capacity_experiment(n_patterns_list: List[int],
         Corresponding retrieval accuracy
     theoretical_capacity : float, optional
         Theoretical capacity (0.138 * N for random patterns)
+    ax : matplotlib axis, optional
+        Axis to plot on, e.g. one figure's axis reused across a sweep
+        (cleared with ax.cla() between calls) instead of a new figure
+        per call
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(10, 6), layout='constrained')
+    else:
+        fig = ax.figure
     
     ax.plot(n_patterns_list, accuracy_list, 'o-', linewidth=2, markersize=8, label='Measured')
     
@@ -208,12 +268,12 @@ def plot_capacity_experiment(n_patterns_list: List[int],
     ax.grid(True, alpha=0.3)
     ax.legend(fontsize=11)
     
-    plt.tight_layout()
     return fig
 
 
 def plot_noise_robustness(noise_levels: List[float], 
-                         accuracy_list: List[float]):
+                         accuracy_list: List[float],
+                         ax=None):
     """
     Plot retrieval accuracy vs noise level.
     
@@ -226,8 +286,15 @@ def plot_noise_robustness(noise_levels: List[float],
         Noise levels tested (fraction of bits flipped)
     accuracy_list : List[float]
         Corresponding retrieval accuracy
+    ax : matplotlib axis, optional
+        Axis to plot on, e.g. one figure's axis reused across a sweep
+        (cleared with ax.cla() between calls) instead of a new figure
+        per call
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(10, 6), layout='constrained')
+    else:
+        fig = ax.figure
     
     ax.plot(np.array(noise_levels) * 100, accuracy_list, 'o-', 
            linewidth=2, markersize=8, color='steelblue')
@@ -244,7 +311,6 @@ def plot_noise_robustness(noise_levels: List[float],
     ax.axhspan(0, 0.5, alpha=0.2, color='red', label='Poor retrieval')
     
     ax.legend(fontsize=10)
-    plt.tight_layout()
     return fig
 
 
@@ -268,19 +334,30 @@ def plot_multiple_patterns(patterns: np.ndarray,
     """
     n_patterns = patterns.shape[0]
     n_rows = (n_patterns + n_cols - 1) // n_cols
-    
-    fig, axes = plt.subplots(n_rows, n_cols, figsize=(2*n_cols, 2*n_rows))
-    axes = axes.flatten() if n_patterns > 1 else [axes]
+    height, width = shape
+    
+    # Tile all patterns into one mosaic drawn by a single imshow instead of
+    # one Axes per pattern. Each tile gets a blank (NaN) band above it for
+    # its title and a narrower one to its right as a gutter.
+    gap_y, gap_x = max(1, height // 3), max(1, width // 5)
+    tiles = np.full((n_rows * n_cols, gap_y + height, width + gap_x), np.nan)
+    tiles[:n_patterns, gap_y:, :width] = patterns.reshape(n_patterns, height, width)
+    mosaic = (tiles.reshape(n_rows, n_cols, gap_y + height, width + gap_x)
+                   .transpose(0, 2, 1, 3)
+                   .reshape(n_rows * (gap_y + height), n_cols * (width + gap_x)))
+    mosaic = mosaic[:, :-gap_x]
+    
+    fig, ax = plt.subplots(figsize=(2*n_cols, 2*n_rows), layout='constrained')
+    ax.imshow(mosaic, cmap=plt.get_cmap('gray').with_extremes(bad='white'),
+              vmin=-1, vmax=1, interpolation='nearest')
+    ax.axis('off')
     
     for i in range(n_patterns):
         title = titles[i] if titles is not None else f"Pattern {i+1}"
-        plot_pattern(patterns[i], shape, title, ax=axes[i])
+        row, col = divmod(i, n_cols)
+        ax.text(col * (width + gap_x) + (width - 1) / 2, row * (gap_y + height) + gap_y - 1,
+                title, ha='center', va='bottom', fontsize='large')
     
-    # Hide unused subplots
-    for i in range(n_patterns, len(axes)):
-        axes[i].axis('off')
-    
-    plt.tight_layout()
     return fig
 
 
@@ -302,18 +379,27 @@ def animate_retrieval(state_trajectory: List[np.ndarray],
     energy_trajectory : List[float], optional
         Corresponding energy values
     save_path : str, optional
-        Path to save animation (e.g., 'retrieval.gif')
+        Path to save animation (e.g., 'retrieval.gif'). .gif, .png, .apng
+        and .webp are written with Pillow; .mp4, .m4v, .mov, .mkv, .avi
+        and .webm need ffmpeg on the PATH
     """
-    fig, axes = plt.subplots(1, 2, figsize=(12, 5))
+    # Stack the states once into a (T, height, width) block, so each frame
+    # is a plain index instead of a reshape of a separate array
+    frames = np.stack(state_trajectory).reshape(-1, *shape)
+    
+    fig, axes = plt.subplots(1, 2, figsize=(12, 5), layout='constrained')
     
     # Setup image plot
-    img = axes[0].imshow(state_trajectory[0].reshape(shape), 
+    img = axes[0].imshow(frames[0], 
                          cmap='gray', vmin=-1, vmax=1, interpolation='nearest')
     axes[0].set_title('Network State')
     axes[0].axis('off')
     
-    # Setup energy plot
+    # Setup energy plot; each frame shows a prefix of these arrays, taken
+    # as slices (views) instead of a new range and list per frame
     if energy_trajectory is not None:
+        energy_ys = np.asarray(energy_trajectory, dtype=float)
+        energy_xs = np.arange(len(energy_ys))
         line, = axes[1].plot([], [], 'o-', linewidth=2, markersize=6)
         axes[1].set_xlim(0, len(energy_trajectory))
         axes[1].set_ylim(min(energy_trajectory) * 1.1, max(energy_trajectory) * 1.1)
@@ -322,19 +408,32 @@ def animate_retrieval(state_trajectory: List[np.ndarray],
         axes[1].set_title('Energy Minimization')
         axes[1].grid(True, alpha=0.3)
     
+    # Blitting redraws exactly the artists update returns, so return each
+    # changed artist once
+    artists = (img,) if energy_trajectory is None else (img, line)
+    
     def update(frame):
-        img.set_data(state_trajectory[frame].reshape(shape))
+        img.set_data(frames[frame])
         if energy_trajectory is not None:
-            line.set_data(range(frame + 1), energy_trajectory[:frame + 1])
-        return img, line if energy_trajectory else img,
+            line.set_data(energy_xs[:frame + 1], energy_ys[:frame + 1])
+        return artists
     
-    anim = FuncAnimation(fig, update, frames=len(state_trajectory), 
+    anim = FuncAnimation(fig, update, frames=len(frames), 
                         interval=200, blit=True, repeat=True)
     
     if save_path:
-        anim.save(save_path, writer='pillow', fps=5)
+        # The extension picks the writer; a format whose writer is missing
+        # is an error rather than a file in the wrong encoding
+        ext = os.path.splitext(save_path)[1].lower()
+        writer_cls = _ANIMATION_WRITERS.get(ext)
+        if writer_cls is None:
+            raise ValueError(f"Cannot save an animation as '{ext or save_path}'; "
+                             f"supported extensions are {', '.join(_ANIMATION_WRITERS)}")
+        if not writer_cls.isAvailable():
+            raise RuntimeError(f"Saving a '{ext}' animation needs ffmpeg, "
+                               f"which was not found on the PATH")
+        anim.save(save_path, writer=writer_cls(fps=5))
     
-    plt.tight_layout()
     return anim
 
 
@@ -355,12 +454,13 @@ def plot_energy_landscape_2d(hopfield_net, patterns: np.ndarray, shape: Tuple[in
     """
     from sklearn.decomposition import PCA
     
-    # Sample random states
+    # Sample random states, as float32 so that neither the energy GEMM nor
+    # PCA has to convert (or upcast) a copy of the samples
     n_samples = 1000
-    states = np.random.choice([-1, 1], size=(n_samples, hopfield_net.n_neurons))
+    states = random_bipolar((n_samples, hopfield_net.n_neurons)).astype(np.float32)
     
-    # Compute energies
-    energies = np.array([hopfield_net.energy(state) for state in states])
+    # Compute energies (one batched call: a single GEMM for all samples)
+    energies = hopfield_net.energy(states)
     
     # Project to 2D using PCA
     pca = PCA(n_components=2)
@@ -368,10 +468,15 @@ def plot_energy_landscape_2d(hopfield_net, patterns: np.ndarray, shape: Tuple[in
     patterns_2d = pca.transform(patterns)
     
     # Plot
-    fig, ax = plt.subplots(figsize=(10, 8))
-    
-    scatter = ax.scatter(states_2d[:, 0], states_2d[:, 1], 
-                        c=energies, cmap='viridis', alpha=0.5, s=20)
+    fig, ax = plt.subplots(figsize=(10, 8), layout='constrained')
+    
+    # Map the energies to colours once; passing RGBA directly skips the
+    # normalise-and-colormap pass the scatter would run on every draw
+    norm = Normalize(vmin=energies.min(), vmax=energies.max())
+    cmap = plt.get_cmap('viridis')
+    colors = cmap(norm(energies))
+    colors[:, 3] = 0.5
+    ax.scatter(states_2d[:, 0], states_2d[:, 1], c=colors, s=20)
     ax.scatter(patterns_2d[:, 0], patterns_2d[:, 1], 
               c='red', s=200, marker='*', edgecolors='black', linewidths=2,
               label='Stored Patterns (Energy Minima)')
@@ -382,6 +487,5 @@ def plot_energy_landscape_2d(hopfield_net, patterns: np.ndarray, shape: Tuple[in
                 fontsize=14)
     ax.legend(fontsize=11)
     
-    plt.colorbar(scatter, ax=ax, label='Energy')
-    plt.tight_layout()
+    plt.colorbar(ScalarMappable(norm=norm, cmap=cmap), ax=ax, label='Energy')
     return fig